@@ -7,6 +7,7 @@ import os
 import json
 from datetime import datetime
 from dotenv import load_dotenv
+from post_store import POSTS_FILE, freshness_cutoff, open_store
 
 # Load environment variables
 load_dotenv()
@@ -18,8 +19,7 @@ def show_status():
     
     # Check posts
     try:
-        with open('technews_posts.json', 'r') as f:
-            posts = json.load(f)
+        posts = open_store(POSTS_FILE).fresh(freshness_cutoff())
         print(f"Available posts: {len(posts)}")
     except FileNotFoundError:
         print("Available posts: 0 (run fetch first)")
@@ -42,7 +42,7 @@ def show_status():
     
     # Calculate remaining
     if posts:
-        remaining = len([p for p in posts if p['id'] not in history.get("posted_ids", [])])
+        remaining = len([p for p in posts if p.id not in history.get("posted_ids", [])])
         print(f"Remaining to post: {remaining}")
     
     # Check LinkedIn credentials
@@ -54,8 +54,7 @@ def show_status():
 def show_next_posts(count=5):
     """Show the next posts that would be posted"""
     try:
-        with open('technews_posts.json', 'r') as f:
-            posts = json.load(f)
+        posts = open_store(POSTS_FILE).fresh(freshness_cutoff())
     except FileNotFoundError:
         print("No posts found. Run fetch first.")
         return
@@ -67,22 +66,22 @@ def show_next_posts(count=5):
         history = {"posted_ids": []}
     
     # Filter unposted posts
-    unposted = [p for p in posts if p['id'] not in history.get("posted_ids", [])]
+    unposted = [p for p in posts if p.id not in history.get("posted_ids", [])]
     
     if not unposted:
         print("No unposted content available.")
         return
     
     # Sort by score
-    unposted.sort(key=lambda x: x['score'], reverse=True)
+    unposted.sort(key=lambda x: x.score, reverse=True)
     
     print(f"Next {min(count, len(unposted))} posts to be shared:")
     print("-" * 60)
     
     for i, post in enumerate(unposted[:count], 1):
-        print(f"{i}. {post['title'][:80]}...")
-        print(f"   Score: {post['score']} | Comments: {post['num_comments']}")
-        print(f"   URL: {post['url']}")
+        print(f"{i}. {post.title[:80]}...")
+        print(f"   Score: {post.score} | Comments: {post.num_comments}")
+        print(f"   URL: {post.url}")
         print()
 
 def reset_posted_history():
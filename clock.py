@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Clocks used by the posting bot
+The system clock is used in production; the simulated clock lets the
+replay harness run a day of scheduling in a fraction of a second
+"""
+
+import time
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class Clock:
+    """Base class; subclasses provide now() as a naive UTC datetime and sleep()"""
+
+    def timestamp(self):
+        """Current time as a Unix timestamp, comparable with created_utc"""
+        return (self.now() - EPOCH).total_seconds()
+
+
+class SystemClock(Clock):
+    """Wall-clock time and real sleeping"""
+
+    def now(self):
+        return datetime.utcnow()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class SimulatedClock(Clock):
+    """Virtual time that only moves when sleep() or advance() is called"""
+
+    def __init__(self, start):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        self._now += timedelta(seconds=seconds)
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Declarative content filter applied to Reddit posts while they are fetched
+Rules are read from a JSON file and compiled once into hashed keyword and
+domain sets plus a single merged regex, so the cost of checking a post
+depends on the length of its title rather than on the number of rules
+
+Example filter_rules.json:
+    {
+        "allow_nsfw": false,
+        "min_score": 5,
+        "min_comments": 0,
+        "keywords": {"allow": [], "deny": ["giveaway", "crypto scam"]},
+        "domains": {"allow": [], "deny": ["example.com"]},
+        "flairs": {"allow": [], "deny": ["Meme"]},
+        "regex": {"allow": [], "deny": ["\\\\bsponsored\\\\b"]}
+    }
+
+Deny rules reject a post on any match. A non-empty allow list requires at
+least one match. Regexes must not use inline global flags, named groups,
+backreferences or conditional group references, since each list is merged
+into one expression. NSFW posts are dropped unless allow_nsfw is set, even
+when there is no rules file. Keywords and regexes are matched against the
+title, domains against the host of the post URL (subdomains included).
+Keywords with punctuation (".NET", "C++") are matched literally.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+
+DEFAULT_RULES_FILE = 'filter_rules.json'
+
+_WORD_RE = re.compile(r"\w+")
+_DEFAULT_FLAGS = re.compile('').flags
+
+
+def _tokenize(text):
+    return _WORD_RE.findall(text.lower())
+
+
+def _literal_pattern(keyword):
+    """Escaped regex for a keyword, whole-word at the edges that are word characters"""
+    pattern = r'\s+'.join(re.escape(part) for part in keyword.split())
+    if re.match(r'\w', keyword):
+        pattern = r'(?<!\w)' + pattern
+    if re.search(r'\w$', keyword):
+        pattern += r'(?!\w)'
+    return pattern
+
+
+def _compile_keywords(keywords):
+    """Normalise keywords to space-joined tokens; returns (set, longest phrase, literal regex)
+
+    Keywords that tokenizing would change, such as ".NET" or "C++", are
+    matched as escaped literals instead so their punctuation is kept.
+    """
+    phrases = set()
+    longest = 0
+    literals = []
+    for keyword in keywords:
+        normalised = ' '.join(keyword.lower().split())
+        if not normalised:
+            continue
+        tokens = _tokenize(keyword)
+        if ' '.join(tokens) != normalised:
+            literals.append(_literal_pattern(normalised))
+            continue
+        phrases.add(normalised)
+        longest = max(longest, len(tokens))
+    literal_regex = re.compile('|'.join(literals), re.IGNORECASE) if literals else None
+    return phrases, longest, literal_regex
+
+
+def _compile_domains(domains):
+    compiled = set()
+    for domain in domains:
+        domain = domain.strip().lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        if domain:
+            compiled.add(domain)
+    return compiled
+
+
+class InvalidRuleError(ValueError):
+    """A rule in the rules file that cannot be compiled"""
+
+
+def _has_backreference(pattern):
+    """Check for numbered (\\1) or named ((?P=name)) backreferences"""
+    if '(?P=' in pattern:
+        return True
+    i = 0
+    while i < len(pattern) - 1:
+        if pattern[i] == '\\':
+            if pattern[i + 1] in '123456789':
+                return True
+            i += 2
+        else:
+            i += 1
+    return False
+
+
+def _validate_regex(pattern, rule):
+    """Compile one pattern on its own and reject what cannot be merged safely"""
+    try:
+        compiled = re.compile(pattern)
+    except re.error as e:
+        raise InvalidRuleError(f"{rule}: invalid regex {pattern!r}: {e}") from None
+    if compiled.flags != _DEFAULT_FLAGS:
+        raise InvalidRuleError(f"{rule}: inline global flags are not supported in {pattern!r}; "
+                               "use a scoped group such as (?i:...)")
+    if compiled.groupindex:
+        raise InvalidRuleError(f"{rule}: named groups are not supported in {pattern!r}")
+    if _has_backreference(pattern):
+        raise InvalidRuleError(f"{rule}: backreferences are not supported in {pattern!r}")
+    if '(?(' in pattern:
+        raise InvalidRuleError(f"{rule}: conditional group references are not supported in {pattern!r}")
+
+
+def _compile_regex(patterns, rule):
+    """Merge the patterns of one list into a single case-insensitive regex
+
+    Each pattern is validated on its own first, so a bad rule is reported by
+    name instead of breaking the merged expression.
+    """
+    if not patterns:
+        return None
+    for index, pattern in enumerate(patterns):
+        _validate_regex(pattern, f"{rule}[{index}]")
+    return re.compile('|'.join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+class ContentFilter:
+    """A compiled set of filter rules"""
+
+    def __init__(self, rules):
+        keywords = rules.get('keywords', {})
+        domains = rules.get('domains', {})
+        flairs = rules.get('flairs', {})
+        regex = rules.get('regex', {})
+
+        self.allow_nsfw = rules.get('allow_nsfw', False)
+        self.min_score = rules.get('min_score')
+        self.min_comments = rules.get('min_comments')
+
+        self.allow_keywords, allow_len, self.allow_keyword_regex = _compile_keywords(keywords.get('allow', []))
+        self.deny_keywords, deny_len, self.deny_keyword_regex = _compile_keywords(keywords.get('deny', []))
+        self.max_phrase_len = max(allow_len, deny_len)
+
+        self.allow_domains = _compile_domains(domains.get('allow', []))
+        self.deny_domains = _compile_domains(domains.get('deny', []))
+
+        self.allow_flairs = {flair.lower() for flair in flairs.get('allow', [])}
+        self.deny_flairs = {flair.lower() for flair in flairs.get('deny', [])}
+
+        self.allow_regex = _compile_regex(regex.get('allow', []), 'regex.allow')
+        self.deny_regex = _compile_regex(regex.get('deny', []), 'regex.deny')
+
+    def _phrases(self, title):
+        """All word n-grams of the title up to the longest configured keyword"""
+        tokens = _tokenize(title)
+        phrases = set()
+        for size in range(1, self.max_phrase_len + 1):
+            for start in range(len(tokens) - size + 1):
+                phrases.add(' '.join(tokens[start:start + size]))
+        return phrases
+
+    @staticmethod
+    def _domain_suffixes(url):
+        host = (urlparse(url).hostname or '').lower()
+        labels = host.split('.')
+        return {'.'.join(labels[i:]) for i in range(len(labels)) if labels[i]}
+
+    def check(self, post):
+        """Return the reason a post is rejected, or None if it passes"""
+        if not self.allow_nsfw and getattr(post, 'over_18', False):
+            return "nsfw"
+        if self.min_score is not None and post.score < self.min_score:
+            return "score"
+        if self.min_comments is not None and post.num_comments < self.min_comments:
+            return "comments"
+
+        if self.allow_flairs or self.deny_flairs:
+            flair = (getattr(post, 'link_flair_text', None) or '').lower()
+            if flair in self.deny_flairs:
+                return "flair"
+            if self.allow_flairs and flair not in self.allow_flairs:
+                return "flair"
+
+        if self.allow_domains or self.deny_domains:
+            suffixes = self._domain_suffixes(post.url)
+            if not suffixes.isdisjoint(self.deny_domains):
+                return "domain"
+            if self.allow_domains and suffixes.isdisjoint(self.allow_domains):
+                return "domain"
+
+        if self.max_phrase_len or self.deny_keyword_regex or self.allow_keyword_regex:
+            phrases = self._phrases(post.title)
+            if not phrases.isdisjoint(self.deny_keywords):
+                return "keyword"
+            if self.deny_keyword_regex and self.deny_keyword_regex.search(post.title):
+                return "keyword"
+            if self.allow_keywords or self.allow_keyword_regex:
+                allowed = (not phrases.isdisjoint(self.allow_keywords)
+                           or bool(self.allow_keyword_regex and self.allow_keyword_regex.search(post.title)))
+                if not allowed:
+                    return "keyword"
+
+        if self.deny_regex and self.deny_regex.search(post.title):
+            return "regex"
+        if self.allow_regex and not self.allow_regex.search(post.title):
+            return "regex"
+
+        return None
+
+    def allows(self, post):
+        """Check if a post passes every rule"""
+        return self.check(post) is None
+
+
+def rules_file_path():
+    """FILTER_RULES_FILE, filter_rules.json by default"""
+    return os.getenv('FILTER_RULES_FILE', DEFAULT_RULES_FILE)
+
+
+def load_content_filter(rules_path=None):
+    """Return the compiled filter for rules_path (FILTER_RULES_FILE by default)"""
+    return _load_content_filter(rules_path or rules_file_path())
+
+
+@lru_cache(maxsize=None)
+def _load_content_filter(rules_path):
+    """Compile the rules file once; without a rules file only NSFW posts are dropped
+
+    Raises InvalidRuleError naming the offending rule if a regex is unusable.
+    """
+    try:
+        with open(rules_path, 'r') as f:
+            rules = json.load(f)
+    except FileNotFoundError:
+        rules = {}
+    return ContentFilter(rules)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Coordination between several bot workers sharing a filesystem
+Workers hold heartbeated leases in a SQLite database, subreddits are split
+between the live workers with rendezvous hashing, and a shared publish
+ledger makes sure a Reddit post is only published once
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from event_log import log_event
+
+DEFAULT_COORDINATION_DB = 'coordination.db'
+LEASE_SECONDS = 90
+
+
+def coordination_db_path():
+    """COORDINATION_DB, coordination.db by default"""
+    return os.getenv('COORDINATION_DB', DEFAULT_COORDINATION_DB)
+
+
+def default_worker_id():
+    """Worker ID from WORKER_ID; raises ValueError if it is not set
+
+    The ID names the worker's post store and history files, so it has to stay
+    the same across restarts instead of being derived from the process.
+    """
+    worker_id = os.getenv('WORKER_ID')
+    if not worker_id:
+        raise ValueError("WORKER_ID is not set; give each worker a stable ID")
+    return worker_id
+
+
+def _rendezvous_weight(worker_id, item):
+    return hashlib.sha1(f"{worker_id}:{item}".encode()).digest()
+
+
+class Coordinator:
+    """Lease, shard assignment and publish ledger for one worker"""
+
+    def __init__(self, worker_id, db_path=None, lease_seconds=LEASE_SECONDS):
+        self.worker_id = worker_id
+        self.db_path = db_path or coordination_db_path()
+        self.lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._heartbeat_thread = None
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    worker_id TEXT PRIMARY KEY,
+                    heartbeat REAL NOT NULL
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ledger (
+                    post_id TEXT PRIMARY KEY,
+                    worker_id TEXT NOT NULL,
+                    claimed_at REAL NOT NULL,
+                    published INTEGER NOT NULL DEFAULT 0
+                )""")
+
+    @contextmanager
+    def _connect(self):
+        """Run one transaction on a fresh connection
+
+        A connection per call keeps this safe to use from the heartbeat
+        thread, and the default rollback journal (rather than WAL) keeps the
+        database usable from several hosts on a shared filesystem.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Leases
+
+    def heartbeat(self):
+        """Renew this worker's lease"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO leases (worker_id, heartbeat) VALUES (?, ?) "
+                "ON CONFLICT(worker_id) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (self.worker_id, time.time())
+            )
+
+    def start_heartbeat(self):
+        """Renew the lease in a background thread until stop() is called
+
+        Claims left unpublished by an earlier run with the same worker ID are
+        released first; otherwise the renewed lease would keep them blocked.
+        """
+        self.release_unpublished()
+        self.heartbeat()
+
+        def beat():
+            while not self._stop.wait(self.lease_seconds / 3):
+                try:
+                    self.heartbeat()
+                except sqlite3.Error as e:
+                    log_event('heartbeat_failed', logging.ERROR, worker_id=self.worker_id, error=str(e))
+
+        self._heartbeat_thread = threading.Thread(target=beat, daemon=True)
+        self._heartbeat_thread.start()
+
+    def stop(self):
+        """Stop heartbeating and give up the lease so shards move right away"""
+        self._stop.set()
+        if self._heartbeat_thread:
+            self._heartbeat_thread.join()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE worker_id = ?", (self.worker_id,))
+
+    def live_workers(self):
+        """IDs of workers whose lease has not expired"""
+        cutoff = time.time() - self.lease_seconds
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT worker_id FROM leases WHERE heartbeat > ? ORDER BY worker_id", (cutoff,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def assigned(self, items):
+        """The subset of items this worker owns among the live workers
+
+        Rendezvous hashing only moves the items of a worker that joins or
+        whose lease expires; everything else stays where it was.
+        """
+        workers = self.live_workers()
+        if self.worker_id not in workers:
+            workers.append(self.worker_id)
+        return [
+            item for item in items
+            if max(workers, key=lambda worker: _rendezvous_weight(worker, item)) == self.worker_id
+        ]
+
+    # Publish ledger
+
+    def is_claimed(self, post_id):
+        """Check if a post is published, or claimed by a worker whose lease is live"""
+        cutoff = time.time() - self.lease_seconds
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM ledger LEFT JOIN leases ON leases.worker_id = ledger.worker_id "
+                "WHERE ledger.post_id = ? AND (ledger.published = 1 OR leases.heartbeat > ?)",
+                (post_id, cutoff)
+            ).fetchone()
+        return row is not None
+
+    def claim(self, post_id):
+        """Reserve a post for publishing; returns False if another worker has it
+
+        An unpublished claim is only taken over once the lease of the worker
+        that made it has expired, so a slow publish by a live worker is never
+        duplicated. Re-claiming one of this worker's own claims succeeds.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM ledger WHERE post_id = ? AND published = 0 AND worker_id != ? "
+                "AND worker_id NOT IN (SELECT worker_id FROM leases WHERE heartbeat > ?)",
+                (post_id, self.worker_id, now - self.lease_seconds)
+            )
+            cursor = conn.execute(
+                "INSERT INTO ledger (post_id, worker_id, claimed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(post_id) DO UPDATE SET claimed_at = excluded.claimed_at "
+                "WHERE ledger.worker_id = excluded.worker_id AND ledger.published = 0",
+                (post_id, self.worker_id, now)
+            )
+            return cursor.rowcount == 1
+
+    def confirm(self, post_id):
+        """Record a claimed post as published; returns False if the claim was lost"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE ledger SET published = 1 WHERE post_id = ? AND worker_id = ?",
+                (post_id, self.worker_id)
+            )
+        if cursor.rowcount == 0:
+            log_event('ledger_claim_lost', logging.ERROR, post_id=post_id, worker_id=self.worker_id,
+                      reason="claim was taken over before publishing finished; post may be duplicated")
+            return False
+        return True
+
+    def release_unpublished(self):
+        """Drop every unpublished claim of this worker, e.g. after a crash mid-publish"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM ledger WHERE worker_id = ? AND published = 0", (self.worker_id,)
+            )
+        if cursor.rowcount:
+            log_event('ledger_claims_released', logging.WARNING, worker_id=self.worker_id,
+                      released=cursor.rowcount)
+
+    def release(self, post_id):
+        """Drop a claim after a failed publish so the post can be retried"""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM ledger WHERE post_id = ? AND worker_id = ? AND published = 0",
+                (post_id, self.worker_id)
+            )
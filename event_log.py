@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Structured, non-blocking event logging for the posting bot
+Events are written to stderr as one JSON object per line by a background
+thread, so a slow log consumer never holds up fetching or publishing, and
+they do not mix with the bot's console messages on stdout. Logging is set up
+on the first event unless setup_logging() was called. Every event carries the
+trace IDs of the cycle and post it belongs to, and stage() records how long
+each step took, so the latency breakdown of a cycle can be rebuilt from the logs
+
+Example event:
+    {"ts": "2026-10-19T12:00:01.512Z", "level": "INFO", "event": "stage",
+     "cycle_id": "3f2a9c1e", "post_trace_id": "b71d04aa", "stage": "publish",
+     "status": "ok", "duration_ms": 412.7}
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+LOGGER_NAME = 'reddit2linkedin'
+LOG_QUEUE_SIZE = 10000
+
+_cycle_id = contextvars.ContextVar('cycle_id', default=None)
+_post_trace_id = contextvars.ContextVar('post_trace_id', default=None)
+
+logger = logging.getLogger(LOGGER_NAME)
+_listener = None
+_handler = None
+_setup_lock = threading.Lock()
+
+
+def _new_trace_id():
+    return uuid.uuid4().hex[:16]
+
+
+class _TraceFilter(logging.Filter):
+    """Stamp records with the trace IDs of the calling context"""
+
+    def filter(self, record):
+        record.cycle_id = _cycle_id.get()
+        record.post_trace_id = _post_trace_id.get()
+        return True
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops events instead of blocking when the queue is full
+
+    Once the queue has room again, a log_events_dropped event reports how
+    many events were lost.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        """Keep the event name as the message and the traceback as exc_text"""
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            if self.dropped:
+                report = logger.makeRecord(logger.name, logging.WARNING, __file__, 0, 'log_events_dropped',
+                                           None, None, extra={'fields': {'dropped': self.dropped}})
+                report.cycle_id = getattr(record, 'cycle_id', None)
+                report.post_trace_id = getattr(record, 'post_trace_id', None)
+                self.queue.put_nowait(report)
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as a single-line JSON event"""
+
+    def format(self, record):
+        event = {
+            'ts': datetime.utcfromtimestamp(record.created).isoformat(timespec='milliseconds') + 'Z',
+            'level': record.levelname,
+            'event': record.getMessage(),
+        }
+        for key in ('cycle_id', 'post_trace_id'):
+            value = getattr(record, key, None)
+            if value:
+                event[key] = value
+        event.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            event['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            event['exc'] = record.exc_text
+        return json.dumps(event, default=str)
+
+
+def log_level():
+    """LOG_LEVEL, INFO by default"""
+    return os.getenv('LOG_LEVEL', 'INFO').upper()
+
+
+def setup_logging(level=None, stream=None):
+    """Route bot events through a bounded queue to a background JSON writer
+
+    Events go to stderr unless another stream is given, at log_level()
+    unless another level is given. Safe to call more than once; only the
+    first call installs the handlers.
+    """
+    global _listener, _handler
+    with _setup_lock:
+        if _listener is not None:
+            return
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _handler = _DroppingQueueHandler(log_queue)
+        _handler.addFilter(_TraceFilter())
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter())
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+        logger.addHandler(_handler)
+        logger.setLevel(level or log_level())
+        logger.propagate = False
+
+
+@atexit.register
+def shutdown_logging():
+    """Write out queued events and remove the handlers installed by setup_logging()"""
+    global _listener, _handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logger.removeHandler(_handler)
+        _listener = _handler = None
+
+
+def log_event(event, level=logging.INFO, exc_info=None, **fields):
+    """Emit a structured event; extra keyword arguments become JSON fields"""
+    if _listener is None:
+        setup_logging()
+    logger.log(level, event, exc_info=exc_info, extra={'fields': fields})
+
+
+@contextmanager
+def cycle_trace():
+    """Give every event inside the block a fresh cycle ID"""
+    token = _cycle_id.set(_new_trace_id())
+    try:
+        yield _cycle_id.get()
+    finally:
+        _cycle_id.reset(token)
+
+
+@contextmanager
+def post_trace(post_id):
+    """Give every event inside the block a fresh post trace ID"""
+    token = _post_trace_id.set(_new_trace_id())
+    try:
+        log_event('post_trace', post_id=post_id)
+        yield _post_trace_id.get()
+    finally:
+        _post_trace_id.reset(token)
+
+
+@contextmanager
+def stage(name, **fields):
+    """Time a pipeline stage and emit its duration when it ends
+
+    The yielded dict can be filled with extra fields for the stage event.
+    """
+    result = dict(fields)
+    started = time.perf_counter()
+    status = 'ok'
+    try:
+        yield result
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        log_event('stage', stage=name, status=status, duration_ms=duration_ms, **result)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory representation of fetched Reddit posts
+Posts are stored in a SQLite database keyed by post ID. Only the fields
+used for ranking and publishing stay resident; the selftext and author
+are looked up by ID when asked for
+
+Candidates are kept in a CandidateStore indexed by creation hour, so posts
+that fall out of the freshness window are evicted a bucket at a time, with
+one range delete on the created_utc index
+"""
+
+import heapq
+import os
+import sqlite3
+from contextlib import contextmanager
+from clock import SYSTEM_CLOCK
+
+POSTS_FILE = 'technews_posts.db'
+DEFAULT_FRESHNESS_HOURS = 24
+BUCKET_SECONDS = 3600
+
+HOT_FIELDS = ('id', 'title', 'url', 'score', 'num_comments', 'created_utc')
+COLD_FIELDS = ('author', 'content')
+
+
+@contextmanager
+def _connect(store_path):
+    """Run one transaction against the store, creating the table if needed"""
+    conn = sqlite3.connect(store_path, timeout=30)
+    try:
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    num_comments INTEGER NOT NULL,
+                    created_utc REAL NOT NULL,
+                    author TEXT,
+                    content TEXT
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS posts_created_utc ON posts (created_utc)")
+            yield conn
+    finally:
+        conn.close()
+
+
+def freshness_hours():
+    """FRESHNESS_HOURS; older posts are never selected and are evicted from the store"""
+    return float(os.getenv('FRESHNESS_HOURS', DEFAULT_FRESHNESS_HOURS))
+
+
+def freshness_cutoff(clock=SYSTEM_CLOCK):
+    """Unix timestamp before which posts are too old to share"""
+    return clock.timestamp() - freshness_hours() * 60 * 60
+
+
+def load_post_field(post_id, field, store_path=POSTS_FILE):
+    """Look up a single cold field of a stored post by ID"""
+    if field not in COLD_FIELDS:
+        raise ValueError(f"Unknown post field: {field}")
+    if not os.path.exists(store_path):
+        return None
+    with _connect(store_path) as conn:
+        row = conn.execute(f"SELECT {field} FROM posts WHERE id = ?", (post_id,)).fetchone()
+    return row[0] if row else None
+
+
+class Post:
+    """A Reddit post holding only the hot fields in memory"""
+
+    __slots__ = HOT_FIELDS + ('store_path',)
+
+    def __init__(self, id, title, url, score, num_comments, created_utc, store_path=POSTS_FILE):
+        self.id = id
+        self.title = title
+        self.url = url
+        self.score = score
+        self.num_comments = num_comments
+        self.created_utc = created_utc
+        self.store_path = store_path
+
+    @classmethod
+    def from_record(cls, record, store_path=POSTS_FILE):
+        """Build a Post from a full post record, dropping the cold fields"""
+        return cls(*(record[field] for field in HOT_FIELDS), store_path=store_path)
+
+    @property
+    def content(self):
+        """Selftext of the post, loaded from the store on demand"""
+        return load_post_field(self.id, 'content', self.store_path)
+
+    @property
+    def author(self):
+        """Author of the post, loaded from the store on demand"""
+        return load_post_field(self.id, 'author', self.store_path)
+
+    def __repr__(self):
+        return f"Post(id={self.id!r}, score={self.score}, title={self.title[:40]!r})"
+
+
+def submission_to_record(submission):
+    """Convert a PRAW submission into the record written to the store"""
+    return {
+        'title': submission.title,
+        'author': str(submission.author),
+        'score': submission.score,
+        'url': submission.url,
+        'created_utc': submission.created_utc,
+        'id': submission.id,
+        'num_comments': submission.num_comments,
+        'content': submission.selftext
+    }
+
+
+def save_records(records, store_path=POSTS_FILE):
+    """Insert post records into the store, replacing stored posts with the same ID"""
+    columns = HOT_FIELDS + COLD_FIELDS
+    updates = ', '.join(f"{column} = excluded.{column}" for column in columns[1:])
+    with _connect(store_path) as conn:
+        conn.executemany(
+            f"INSERT INTO posts ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}",
+            [tuple(record[column] for column in columns) for record in records]
+        )
+
+
+def load_posts(store_path=POSTS_FILE):
+    """Load stored posts as Post objects; raises FileNotFoundError if missing"""
+    if not os.path.exists(store_path):
+        raise FileNotFoundError(store_path)
+    with _connect(store_path) as conn:
+        rows = conn.execute(f"SELECT {', '.join(HOT_FIELDS)} FROM posts").fetchall()
+    return [Post(*row, store_path=store_path) for row in rows]
+
+
+class CandidateStore:
+    """Stored posts keyed by ID, with a time-bucketed index on created_utc
+
+    Each bucket holds the IDs of the posts created within one BUCKET_SECONDS
+    slot, and a min-heap keeps the bucket slots in order. Evicting expired
+    posts pops whole buckets off the heap and removes them on disk with a
+    single DELETE over the created_utc index, so a tick only does work for
+    the posts that actually expired.
+    """
+
+    def __init__(self, store_path=POSTS_FILE, bucket_seconds=BUCKET_SECONDS):
+        self.store_path = store_path
+        self.bucket_seconds = bucket_seconds
+        self.posts = {}
+        self._buckets = {}
+        self._bucket_heap = []
+        self._mtime = None
+
+    @classmethod
+    def load(cls, store_path=POSTS_FILE, missing_ok=False):
+        """Build a store from the hot fields on disk; an empty store if missing_ok and absent"""
+        store = cls(store_path)
+        try:
+            posts = load_posts(store_path)
+        except FileNotFoundError:
+            if not missing_ok:
+                raise
+            return store
+        for post in posts:
+            store.add(post)
+        store._mtime = os.stat(store_path).st_mtime_ns
+        return store
+
+    def __len__(self):
+        return len(self.posts)
+
+    def _written(self):
+        """Remember our own write so open_store does not reload because of it"""
+        self._mtime = os.stat(self.store_path).st_mtime_ns
+
+    def add(self, post):
+        """Insert a post, or refresh the hot fields of one already stored"""
+        existing = self.posts.get(post.id)
+        if existing is not None:
+            existing.title = post.title
+            existing.url = post.url
+            existing.score = post.score
+            existing.num_comments = post.num_comments
+            return
+        self.posts[post.id] = post
+        slot = int(post.created_utc // self.bucket_seconds)
+        bucket = self._buckets.get(slot)
+        if bucket is None:
+            bucket = self._buckets[slot] = []
+            heapq.heappush(self._bucket_heap, slot)
+        bucket.append(post.id)
+
+    def merge(self, records):
+        """Add freshly fetched records to memory and upsert them on disk"""
+        save_records(records, self.store_path)
+        for record in records:
+            self.add(Post.from_record(record, self.store_path))
+        self._written()
+
+    def update_counts(self, counts):
+        """Write refreshed (score, num_comments) pairs, keyed by post ID, to memory and disk
+
+        Only the rows whose counts changed are updated, in one transaction.
+        """
+        changed = []
+        for post_id, (score, num_comments) in counts.items():
+            post = self.posts.get(post_id)
+            if post is None or (post.score, post.num_comments) == (score, num_comments):
+                continue
+            post.score = score
+            post.num_comments = num_comments
+            changed.append((score, num_comments, post_id))
+        if not changed:
+            return
+        with _connect(self.store_path) as conn:
+            conn.executemany("UPDATE posts SET score = ?, num_comments = ? WHERE id = ?", changed)
+        self._written()
+
+    def evict_expired(self, cutoff_utc):
+        """Drop every bucket that ends at or before cutoff_utc; returns the evicted IDs
+
+        The bucket straddling the cutoff is kept, so callers still check
+        created_utc against the cutoff (see fresh()).
+        """
+        evicted = []
+        bucket_end = None
+        while self._bucket_heap and (self._bucket_heap[0] + 1) * self.bucket_seconds <= cutoff_utc:
+            slot = heapq.heappop(self._bucket_heap)
+            bucket_end = (slot + 1) * self.bucket_seconds
+            for post_id in self._buckets.pop(slot):
+                del self.posts[post_id]
+                evicted.append(post_id)
+        if bucket_end is not None:
+            with _connect(self.store_path) as conn:
+                conn.execute("DELETE FROM posts WHERE created_utc < ?", (bucket_end,))
+            self._written()
+        return evicted
+
+    def fresh(self, cutoff_utc):
+        """Stored posts created after cutoff_utc"""
+        return [post for post in self.posts.values() if post.created_utc > cutoff_utc]
+
+
+_open_stores = {}
+
+
+def open_store(store_path=POSTS_FILE, missing_ok=False):
+    """Return the cached CandidateStore for a path, reloading it if the file changed
+
+    Keeping the store in memory across ticks is what makes eviction
+    incremental; the hot fields are only read again after another process
+    wrote to the database.
+    """
+    key = os.path.abspath(store_path)
+    store = _open_stores.get(key)
+    try:
+        mtime = os.stat(store_path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    if store is None or store._mtime != mtime:
+        store = CandidateStore.load(store_path, missing_ok=missing_ok)
+        _open_stores[key] = store
+    return store
@@ -1,18 +1,39 @@
 import praw
 import json
-from datetime import datetime, timedelta
+import logging
+from datetime import timedelta
 import os
 import requests
 import secrets
 import base64
 import hashlib
+import itertools
 import webbrowser
 import time
 from dotenv import load_dotenv, set_key, find_dotenv
 from oauth_server import start_oauth_server
+from clock import SYSTEM_CLOCK
+from content_filter import InvalidRuleError, load_content_filter
+from coordination import Coordinator, default_worker_id
+from event_log import cycle_trace, log_event, post_trace, setup_logging, stage
+from post_store import POSTS_FILE, freshness_cutoff, open_store, submission_to_record
 
 load_dotenv()
 
+HISTORY_FILE = 'posted_history.json'
+LISTING_LIMIT = 100  # Newest posts requested per subreddit on each fetch
+MERGE_CHUNK_SIZE = 25  # Fetched records held in memory, selftext included, before they are stored
+INFO_BATCH_SIZE = 100  # Reddit's limit on fullnames per /api/info request
+LINKEDIN_TIMEOUT = 30  # Seconds before a LinkedIn request is given up; a read timeout counts as posted
+
+def configured_subreddits():
+    """REDDIT_SUBREDDITS as a list, technews by default; split between workers in worker mode"""
+    return [name.strip() for name in os.getenv('REDDIT_SUBREDDITS', 'technews').split(',') if name.strip()]
+
+def refresh_top_n():
+    """REFRESH_TOP_N: how many of the top queued candidates get live scores before each selection"""
+    return int(os.getenv('REFRESH_TOP_N', '100'))
+
 def get_linkedin_access_token():
     """Get LinkedIn access token using OAuth 2.0 with automatic browser flow"""
     client_id = os.getenv('LINKEDIN_CLIENT_ID')
@@ -145,13 +166,12 @@ def get_linkedin_profile(access_token):
     }
     
     try:
-        response = requests.get(api_url, headers=headers)
+        response = requests.get(api_url, headers=headers, timeout=LINKEDIN_TIMEOUT)
         if response.status_code == 200:
             profile_data = response.json()
             person_id = profile_data.get('id')
             if person_id:
-                print(f"Your LinkedIn Person ID: {person_id}")
-                print(f"Correct Person URN: urn:li:person:{person_id}")
+                log_event('linkedin_profile', logging.DEBUG, person_urn=f"urn:li:person:{person_id}")
                 
                 # Save the correct URN to .env
                 env_path = find_dotenv()
@@ -159,19 +179,25 @@ def get_linkedin_profile(access_token):
                 
                 return f"urn:li:person:{person_id}"
             else:
-                print("Could not get person ID from profile")
+                log_event('linkedin_profile_failed', logging.WARNING, reason="no person ID in profile")
                 return None
         else:
-            print(f"Failed to get profile: {response.status_code} - {response.text}")
+            log_event('linkedin_profile_failed', logging.WARNING,
+                      status_code=response.status_code, body=response.text)
             return None
     except Exception as e:
-        print(f"Error getting LinkedIn profile: {e}")
+        log_event('linkedin_profile_failed', logging.WARNING, error=str(e))
         return None
 
 def post_to_linkedin(title, url, access_token):
-    """Post to LinkedIn using the API"""
+    """Post to LinkedIn using the API
+    
+    Returns True on success and False on failure. Returns None when the
+    request timed out after being sent, since LinkedIn may have published it.
+    """
     # First, get the correct Person URN
-    correct_urn = get_linkedin_profile(access_token)
+    with stage('linkedin_profile'):
+        correct_urn = get_linkedin_profile(access_token)
     if not correct_urn:
         # Fall back to the URN from .env, but fix the format
         person_urn = os.getenv('LINKEDIN_PERSON_URN')
@@ -181,10 +207,8 @@ def post_to_linkedin(title, url, access_token):
             correct_urn = f"urn:li:person:{person_urn}" if person_urn else None
     
     if not correct_urn:
-        print("Error: Could not determine LinkedIn Person URN")
-        return
-    
-    print(f"Using Person URN: {correct_urn}")
+        log_event('linkedin_post_failed', logging.ERROR, reason="could not determine LinkedIn Person URN")
+        return False
     
     api_url = "https://api.linkedin.com/v2/ugcPosts"
     headers = {
@@ -217,162 +241,294 @@ def post_to_linkedin(title, url, access_token):
         }
     }
     
-    print(f"Payload author field: {payload['author']}")
+    log_event('linkedin_payload', logging.DEBUG, author=payload['author'])
     
-    response = requests.post(api_url, headers=headers, json=payload)
+    try:
+        with stage('linkedin_request') as fields:
+            response = requests.post(api_url, headers=headers, json=payload, timeout=LINKEDIN_TIMEOUT)
+            fields['status_code'] = response.status_code
+    except requests.exceptions.ReadTimeout as e:
+        log_event('linkedin_post_unknown', logging.WARNING, error=str(e))
+        return None
+    except requests.exceptions.RequestException as e:
+        log_event('linkedin_post_failed', logging.ERROR, error=str(e))
+        return False
     if response.status_code == 201:
-        print("Successfully posted to LinkedIn!")
         return True
     else:
-        print(f"LinkedIn post failed: {response.status_code} - {response.text}")
+        log_event('linkedin_post_failed', logging.ERROR,
+                  status_code=response.status_code, body=response.text)
         return False
 
-def fetch_reddit_posts():
+def create_reddit_client():
+    """Create a read-only Reddit client from the .env credentials"""
+    return praw.Reddit(
+        client_id=os.getenv('REDDIT_CLIENT_ID'),
+        client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
+        user_agent=os.getenv('REDDIT_USER_AGENT')
+    )
+
+def subreddit_listing(reddit, subreddits, limit=LISTING_LIMIT):
+    """Newest posts of each subreddit in turn, up to limit per subreddit
+    
+    A combined r/a+b listing shares one limit, so a busy subreddit would
+    crowd a quiet one out of it.
+    """
+    return itertools.chain.from_iterable(
+        reddit.subreddit(name).new(limit=limit) for name in subreddits
+    )
+
+def fetch_reddit_posts(listing=None, clock=SYSTEM_CLOCK, content_filter=None,
+                       subreddits=None, store_path=POSTS_FILE, history_path=HISTORY_FILE):
+    """Fetch recent posts from the configured subreddits and save them to the store
+    
+    listing can be any iterable of submission-like objects; when omitted the
+    newest posts of subreddits (configured_subreddits() by default) are requested from
+    Reddit through PRAW. Posts rejected by content_filter (the compiled
+    filter_rules.json by default) are never stored. Returns the fetched posts.
+    """
     try:
-        # Initialize Reddit instance
-        reddit = praw.Reddit(
-            client_id=os.getenv('REDDIT_CLIENT_ID'),
-            client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
-            user_agent=os.getenv('REDDIT_USER_AGENT')
-        )
-        
-        # Calculate time 24 hours ago
-        time_24h_ago = datetime.utcnow() - timedelta(hours=24)
-        
-        # Fetch posts from r/technews
-        subreddit = reddit.subreddit('technews')
-        posts = []
-        
-        for post in subreddit.new(limit=100):  # Limit to 100 posts max
-            post_time = datetime.utcfromtimestamp(post.created_utc)
-            if post_time > time_24h_ago:
-                posts.append({
-                    'title': post.title,
-                    'author': str(post.author),
-                    'score': post.score,
-                    'url': post.url,
-                    'created_utc': post.created_utc,
-                    'id': post.id,
-                    'num_comments': post.num_comments,
-                    'content': post.selftext
-                })
-          # Save to JSON file
-        with open('technews_posts.json', 'w') as f:
-            json.dump(posts, f, indent=2)
-        
-        print(f"Successfully saved {len(posts)} posts to technews_posts.json")
-          # Show summary
-        history = load_posted_history()
-        remaining_posts = len([p for p in posts if not is_post_already_posted(p['id'], history)])
-        print(f"Total posts: {len(posts)} | New posts: {remaining_posts}")
-        
-        if remaining_posts > 0:
-            print("\nTo start automated posting, run:")
-            print("   python reddit_fetcher.py schedule")
-            print("\nTo post a single post now, run:")
-            print("   python reddit_fetcher.py post")
+        with stage('fetch') as fields:
+            if content_filter is None:
+                content_filter = load_content_filter()
+            
+            if listing is None:
+                # Initialize Reddit instance
+                reddit = create_reddit_client()
+            
+                # Fetch the newest posts of every subreddit
+                listing = subreddit_listing(reddit, subreddits or configured_subreddits())
+            
+            # Only keep posts inside the freshness window
+            cutoff_utc = freshness_cutoff(clock)
+            store = open_store(store_path, missing_ok=True)
+            store.evict_expired(cutoff_utc)
+            
+            fetched_ids = []
+            records = []
+            filtered = 0
+            
+            # Store full records a chunk at a time; only the hot fields stay in memory
+            for post in listing:
+                if post.created_utc <= cutoff_utc:
+                    continue
+                if not content_filter.allows(post):
+                    filtered += 1
+                    continue
+                records.append(submission_to_record(post))
+                fetched_ids.append(post.id)
+                if len(records) >= MERGE_CHUNK_SIZE:
+                    store.merge(records)
+                    records = []
+            if records:
+                store.merge(records)
+            posts = [store.posts[post_id] for post_id in fetched_ids]
+            
+            history = load_posted_history(history_path)
+            fields.update(
+                store_path=store_path,
+                fetched=len(posts),
+                filtered=filtered,
+                new=len([p for p in posts if not is_post_already_posted(p.id, history)]),
+                stored=len(store),
+            )
+        return posts
     
     except Exception as e:
-        print(f"Error: {str(e)}")
+        log_event('fetch_failed', logging.ERROR, error=str(e))
 
-def load_posted_history():
+def load_posted_history(history_path=HISTORY_FILE):
     """Load the history of already posted content"""
     try:
-        with open('posted_history.json', 'r') as f:
+        with open(history_path, 'r') as f:
             return json.load(f)
     except FileNotFoundError:
         return {"posted_ids": [], "last_posted": None}
     except Exception as e:
-        print(f"Error loading posted history: {e}")
+        log_event('history_load_failed', logging.ERROR, error=str(e))
         return {"posted_ids": [], "last_posted": None}
 
-def save_posted_history(history):
+def save_posted_history(history, history_path=HISTORY_FILE):
     """Save the history of posted content"""
     try:
-        with open('posted_history.json', 'w') as f:
+        with open(history_path, 'w') as f:
             json.dump(history, f, indent=2)
     except Exception as e:
-        print(f"Error saving posted history: {e}")
+        log_event('history_save_failed', logging.ERROR, error=str(e))
 
 def is_post_already_posted(post_id, history):
     """Check if a post has already been posted"""
     return post_id in history.get("posted_ids", [])
 
-def mark_post_as_posted(post_id, history):
+def mark_post_as_posted(post_id, history, clock=SYSTEM_CLOCK):
     """Mark a post as posted"""
     if "posted_ids" not in history:
         history["posted_ids"] = []
     if post_id not in history["posted_ids"]:
         history["posted_ids"].append(post_id)
-        history["last_posted"] = datetime.utcnow().isoformat()
+        history["last_posted"] = clock.now().isoformat()
 
-def get_next_post_to_share():
-    """Get the next post to share from the stored posts"""
+def refresh_candidate_scores(info=None, store_path=POSTS_FILE, history_path=HISTORY_FILE,
+                             clock=SYSTEM_CLOCK, limit=None):
+    """Re-read live score and comment counts for the top queued candidates
+    
+    Candidates are looked up INFO_BATCH_SIZE fullnames per request through
+    reddit.info() (or the given info callable, which takes a list of
+    fullnames), and the new counts are written back into the store.
+    limit defaults to refresh_top_n(). Returns the number of posts refreshed.
+    """
+    if limit is None:
+        limit = refresh_top_n()
     try:
-        # Load the posts
-        with open('technews_posts.json', 'r') as f:
-            posts = json.load(f)
+        store = open_store(store_path)
+    except FileNotFoundError:
+        return 0
+    
+    history = load_posted_history(history_path)
+    candidates = [post for post in store.fresh(freshness_cutoff(clock))
+                  if not is_post_already_posted(post.id, history)]
+    candidates.sort(key=lambda x: x.score, reverse=True)
+    candidates = candidates[:limit]
+    if not candidates:
+        return 0
+    
+    if info is None:
+        reddit = create_reddit_client()
+        info = lambda fullnames: reddit.info(fullnames=fullnames)
+    
+    counts = {}
+    for start in range(0, len(candidates), INFO_BATCH_SIZE):
+        fullnames = [f"t3_{post.id}" for post in candidates[start:start + INFO_BATCH_SIZE]]
+        for submission in info(fullnames):
+            counts[submission.id] = (submission.score, submission.num_comments)
+    
+    store.update_counts(counts)
+    return len(counts)
+
+def get_next_post_to_share(store_path=POSTS_FILE, history_path=HISTORY_FILE, ledger=None, clock=SYSTEM_CLOCK):
+    """Get the next post to share from the stored posts
+    
+    Posts older than FRESHNESS_HOURS are evicted from the store and never
+    selected. With a shared ledger (worker mode), posts another worker has
+    published or is publishing are skipped as well.
+    """
+    try:
+        # Load the posts, dropping the ones that fell out of the freshness window
+        store = open_store(store_path)
+        cutoff_utc = freshness_cutoff(clock)
+        store.evict_expired(cutoff_utc)
+        posts = store.fresh(cutoff_utc)
         
         # Load posted history
-        history = load_posted_history()
+        history = load_posted_history(history_path)
         
         # Filter posts that haven't been posted yet
-        unposted_posts = [post for post in posts if not is_post_already_posted(post['id'], history)]
+        unposted_posts = [post for post in posts if not is_post_already_posted(post.id, history)]
         
         if not unposted_posts:
-            print("No new posts to share. All posts have been posted.")
+            log_event('queue_empty', candidates=len(posts))
             return None, history
         
         # Sort by score (most popular first) or by date (newest first)
-        unposted_posts.sort(key=lambda x: x['score'], reverse=True)
+        unposted_posts.sort(key=lambda x: x.score, reverse=True)
+        
+        if ledger is None:
+            return unposted_posts[0], history
+        
+        for post in unposted_posts:
+            if not ledger.is_claimed(post.id):
+                return post, history
         
-        return unposted_posts[0], history
+        log_event('queue_empty', candidates=len(posts), reason="all claimed by other workers")
+        return None, history
         
     except FileNotFoundError:
-        print("No posts found. Run fetch_reddit_posts() first.")
-        return None, load_posted_history()
+        log_event('queue_empty', reason="no post store yet", store_path=store_path)
+        return None, load_posted_history(history_path)
     except Exception as e:
-        print(f"Error getting next post: {e}")
-        return None, load_posted_history()
+        log_event('select_failed', logging.ERROR, error=str(e))
+        return None, load_posted_history(history_path)
 
-def scheduled_post():
-    """Post a single post to LinkedIn (called by scheduler)"""
-    print(f"\n{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} - Checking for posts to share...")
-    
-    # Get next post to share
-    post, history = get_next_post_to_share()
-    
-    if not post:
-        print("No unposted content available. Fetching new posts from Reddit...")
+def scheduled_post(clock=SYSTEM_CLOCK, fetch=None, publish=None,
+                   store_path=POSTS_FILE, history_path=HISTORY_FILE, ledger=None, refresh=None):
+    """Post a single post to LinkedIn (called by scheduler)
+    
+    fetch, refresh and publish can be swapped out (e.g. by the replay harness);
+    publish is called as publish(title, url) and returns True on success.
+    refresh runs before selection to bring candidate scores up to date.
+    With a ledger, the post is claimed in it before publishing so that no
+    two workers publish the same post. Returns True if a post was published.
+    """
+    if fetch is None:
+        fetch = lambda: fetch_reddit_posts(clock=clock, store_path=store_path, history_path=history_path)
+    if refresh is None:
+        refresh = lambda: refresh_candidate_scores(store_path=store_path, history_path=history_path, clock=clock)
+    
+    with cycle_trace(), stage('cycle', scheduled_at=clock.now().isoformat()) as cycle:
+        # Bring scores of the top candidates up to date before ranking
         try:
-            fetch_reddit_posts()
-            print("Successfully fetched new posts. Trying again...")
-            post, history = get_next_post_to_share()
-            if not post:
-                print("Still no posts available after fetching. Will try again next cycle.")
-                return
+            with stage('refresh') as fields:
+                fields['refreshed'] = refresh()
         except Exception as e:
-            print(f"Failed to fetch new posts: {e}")
-            return
-    
-    # Get access token
-    access_token = os.getenv('LINKEDIN_ACCESS_TOKEN')
-    if not access_token:
-        print("No LinkedIn access token found. Please run authentication first.")
-        return
-    
-    # Post to LinkedIn
-    print(f"Posting to LinkedIn: {post['title']}")
-    success = post_to_linkedin(post['title'], post['url'], access_token)
-    
-    if success:
-        # Mark as posted
-        mark_post_as_posted(post['id'], history)
-        save_posted_history(history)
-        print(f"Successfully posted: {post['title']}")
-        print(f"Post score: {post['score']} | Comments: {post['num_comments']}")
-    else:
-        print(f"Failed to post: {post['title']}")
+            log_event('refresh_failed', logging.WARNING, error=str(e))
+        
+        # Get next post to share
+        with stage('select'):
+            post, history = get_next_post_to_share(store_path, history_path, ledger, clock)
+        
+        if not post:
+            # No unposted content available, fetch new posts from Reddit
+            try:
+                fetch()
+                with stage('select'):
+                    post, history = get_next_post_to_share(store_path, history_path, ledger, clock)
+                if not post:
+                    cycle['outcome'] = 'no_posts'
+                    return False
+            except Exception as e:
+                log_event('fetch_failed', logging.ERROR, error=str(e))
+                cycle['outcome'] = 'fetch_failed'
+                return False
+        
+        if publish is None:
+            # Get access token
+            access_token = os.getenv('LINKEDIN_ACCESS_TOKEN')
+            if not access_token:
+                log_event('no_access_token', logging.ERROR,
+                          hint="run python test_linkedin_auth.py to authenticate")
+                cycle['outcome'] = 'no_access_token'
+                return False
+            publish = lambda title, url: post_to_linkedin(title, url, access_token)
+        
+        with post_trace(post.id):
+            if ledger is not None and not ledger.claim(post.id):
+                log_event('claimed_by_other_worker', post_id=post.id)
+                cycle['outcome'] = 'claimed_by_other_worker'
+                return False
+            
+            # Post to LinkedIn
+            with stage('publish', post_id=post.id, title=post.title,
+                       score=post.score, num_comments=post.num_comments) as fields:
+                success = publish(post.title, post.url)
+                fields['success'] = success
+            
+            if success is None:
+                # The publish may have gone through; treat it as posted rather than risk a duplicate
+                log_event('publish_outcome_unknown', logging.WARNING, post_id=post.id)
+            
+            if success or success is None:
+                # Mark as posted
+                if ledger is not None:
+                    ledger.confirm(post.id)
+                mark_post_as_posted(post.id, history, clock)
+                save_posted_history(history, history_path)
+                cycle['outcome'] = 'published'
+                return True
+            else:
+                if ledger is not None:
+                    ledger.release(post.id)
+                cycle['outcome'] = 'publish_failed'
+                return False
 
 def run_scheduler():
     """Run the posting scheduler"""
@@ -401,21 +557,28 @@ def run_scheduler():
     except KeyboardInterrupt:
         print("\nScheduler stopped by user")
 
-def manual_posting_loop():
-    """Simple manual posting loop without external dependencies"""
+def manual_posting_loop(clock=SYSTEM_CLOCK, interval_hours=1, until=None, cycle=None):
+    """Simple manual posting loop without external dependencies
+    
+    With a simulated clock, until and cycle let the replay harness drive the
+    same loop at virtual speed and stop once the clock passes until.
+    """
+    if cycle is None:
+        cycle = lambda: scheduled_post(clock=clock)
+    
     print("Starting simple posting loop...")
-    print("Posts will be shared every 1 hour")
+    print(f"Posts will be shared every {interval_hours:g} hour(s)")
     print("Press Ctrl+C to stop\n")
     
     # Post immediately if there are unposted posts
     print("Checking for immediate post...")
-    scheduled_post()
+    cycle()
     
     try:
-        while True:
-            print(f"Sleeping for 1 hour... (next post at {(datetime.utcnow() + timedelta(hours=1)).strftime('%H:%M:%S')})")
-            time.sleep(1 * 60 * 60)  # Sleep for 1 hour
-            scheduled_post()
+        while until is None or clock.now() + timedelta(hours=interval_hours) <= until:
+            print(f"Sleeping for {interval_hours:g} hour(s)... (next post at {(clock.now() + timedelta(hours=interval_hours)).strftime('%H:%M:%S')})")
+            clock.sleep(interval_hours * 60 * 60)
+            cycle()
     except KeyboardInterrupt:
         print("\nPosting loop stopped by user")
 
@@ -426,17 +589,16 @@ def start_posting_bot():
     
     # Check if we have posts to work with
     try:
-        with open('technews_posts.json', 'r') as f:
-            posts = json.load(f)
-        print(f"Found {len(posts)} posts in storage")
+        posts = open_store(POSTS_FILE).fresh(freshness_cutoff())
+        print(f"Found {len(posts)} fresh posts in storage")
     except FileNotFoundError:
         print("No posts found. Fetching posts first...")
-        fetch_reddit_posts()
+        fetch_command()
         return
       # Check posted history
     history = load_posted_history()
     posted_count = len(history.get("posted_ids", []))
-    remaining_posts = len([p for p in posts if not is_post_already_posted(p['id'], history)])
+    remaining_posts = len([p for p in posts if not is_post_already_posted(p.id, history)])
     
     print(f"Already posted: {posted_count}")
     print(f"Remaining to post: {remaining_posts}")
@@ -459,6 +621,55 @@ def start_posting_bot():
     except KeyboardInterrupt:
         print("\nGoodbye!")
 
+def run_worker(worker_id=None, interval_hours=1):
+    """Run one of several workers that split REDDIT_SUBREDDITS between them
+    
+    Workers coordinate through COORDINATION_DB (SQLite) on a shared
+    filesystem: each keeps a heartbeated lease, owns the subreddits that
+    rendezvous hashing assigns it among the live workers, and claims every
+    post in the shared publish ledger before publishing it. Shards move to
+    the remaining workers once a worker's lease expires.
+    
+    The worker ID comes from WORKER_ID when not given and must stay the
+    same across restarts, since it names the worker's store and history.
+    """
+    worker_id = worker_id or default_worker_id()
+    coordinator = Coordinator(worker_id)
+    store_path = f"posts.{worker_id}.db"
+    history_path = f"posted_history.{worker_id}.json"
+    
+    def cycle():
+        shard = coordinator.assigned(configured_subreddits())
+        log_event('worker_shard', worker_id=worker_id,
+                  live_workers=len(coordinator.live_workers()), shard=shard)
+        if not shard:
+            return False
+        fetch = lambda: fetch_reddit_posts(subreddits=shard, store_path=store_path, history_path=history_path)
+        return scheduled_post(fetch=fetch, store_path=store_path, history_path=history_path, ledger=coordinator)
+    
+    coordinator.start_heartbeat()
+    try:
+        manual_posting_loop(interval_hours=interval_hours, cycle=cycle)
+    finally:
+        coordinator.stop()
+
+def fetch_command():
+    """Fetch posts and print a summary with the next steps"""
+    posts = fetch_reddit_posts()
+    if posts is None:
+        print("Fetching failed, see the log for details.")
+        return
+    
+    history = load_posted_history()
+    remaining_posts = len([p for p in posts if not is_post_already_posted(p.id, history)])
+    print(f"Total posts: {len(posts)} | New posts: {remaining_posts}")
+    
+    if remaining_posts > 0:
+        print("\nTo start automated posting, run:")
+        print("   python reddit_fetcher.py schedule")
+        print("\nTo post a single post now, run:")
+        print("   python reddit_fetcher.py post")
+
 def post_single():
     """Post a single post immediately"""
     print("Posting single post...")
@@ -467,6 +678,15 @@ def post_single():
 if __name__ == "__main__":
     import sys
     
+    setup_logging()
+    
+    # Refuse to start on a broken rules file rather than failing every fetch
+    try:
+        load_content_filter()
+    except InvalidRuleError as e:
+        print(f"Invalid content filter rule: {e}")
+        sys.exit(1)
+    
     if len(sys.argv) > 1:
         command = sys.argv[1]
         if command == "schedule":
@@ -474,12 +694,20 @@ if __name__ == "__main__":
         elif command == "post":
             post_single()
         elif command == "fetch":
-            fetch_reddit_posts()
+            fetch_command()
+        elif command == "worker":
+            try:
+                worker_id = sys.argv[2] if len(sys.argv) > 2 else default_worker_id()
+            except ValueError as e:
+                print(f"Cannot start worker: {e}")
+                sys.exit(1)
+            run_worker(worker_id)
         else:
             print("Available commands:")
             print("  python reddit_fetcher.py fetch    - Fetch new Reddit posts")
             print("  python reddit_fetcher.py post     - Post single post immediately")
             print("  python reddit_fetcher.py schedule - Start automated posting")
+            print("  python reddit_fetcher.py worker [id] - Run as one of several sharded workers")
     else:
         # Default behavior - just fetch posts
-        fetch_reddit_posts()
+        fetch_command()
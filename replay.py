@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Replay harness for the posting pipeline
+Captures Reddit listing snapshots to disk and replays them through the
+fetch -> dedupe -> rank -> publish pipeline on a simulated clock, against a
+stubbed publisher, to size schedules and check backlog drain behavior
+
+Usage:
+    python replay.py capture snapshots/
+    python replay.py run snapshots/ [--interval-hours 1] [--hours 24] [--verbose]
+"""
+
+import argparse
+import bisect
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import reddit_fetcher
+from clock import SYSTEM_CLOCK, SimulatedClock
+from content_filter import load_content_filter, rules_file_path
+from event_log import setup_logging
+from post_store import POSTS_FILE, freshness_cutoff, open_store, submission_to_record
+
+SNAPSHOT_TIME_FORMAT = '%Y%m%dT%H%M%S'
+
+
+def capture_snapshot(directory, clock=SYSTEM_CLOCK):
+    """Save the current listing of the configured subreddits to a timestamped snapshot file"""
+    os.makedirs(directory, exist_ok=True)
+    captured = clock.now()
+    listing = reddit_fetcher.subreddit_listing(reddit_fetcher.create_reddit_client(),
+                                                reddit_fetcher.configured_subreddits())
+    snapshot = {
+        'captured_utc': clock.timestamp(),
+        'posts': [],
+    }
+    for post in listing:
+        record = submission_to_record(post)
+        # Keep the fields the content filter looks at but the store does not
+        record['over_18'] = post.over_18
+        record['link_flair_text'] = post.link_flair_text
+        snapshot['posts'].append(record)
+    path = os.path.join(directory, f"{captured.strftime(SNAPSHOT_TIME_FORMAT)}.json")
+    with open(path, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+    print(f"Captured {len(snapshot['posts'])} posts to {path}")
+    return path
+
+
+class SnapshotFeed:
+    """Serves the most recent snapshot captured at or before a given time"""
+
+    def __init__(self, directory):
+        snapshots = []
+        for name in os.listdir(directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(os.path.abspath(directory), name)
+            with open(path, 'r') as f:
+                captured_utc = json.load(f)['captured_utc']
+            snapshots.append((datetime.utcfromtimestamp(captured_utc), path))
+        if not snapshots:
+            raise ValueError(f"No snapshots found in {directory}")
+        snapshots.sort()
+        self.times = [captured for captured, _ in snapshots]
+        self.paths = [path for _, path in snapshots]
+
+    @property
+    def start(self):
+        return self.times[0]
+
+    @property
+    def end(self):
+        return self.times[-1]
+
+    def listing_at(self, when):
+        """Return submission-like objects from the snapshot in effect at when"""
+        index = bisect.bisect_right(self.times, when) - 1
+        if index < 0:
+            return []
+        with open(self.paths[index], 'r') as f:
+            records = json.load(f)['posts']
+        return [
+            SimpleNamespace(
+                title=record['title'],
+                author=record['author'],
+                score=record['score'],
+                url=record['url'],
+                created_utc=record['created_utc'],
+                id=record['id'],
+                num_comments=record['num_comments'],
+                selftext=record['content'],
+                over_18=record.get('over_18', False),
+                link_flair_text=record.get('link_flair_text'),
+            )
+            for record in records
+        ]
+
+
+class ReplayStats:
+    """Counters collected while replaying"""
+
+    def __init__(self):
+        self.cycles = 0
+        self.fetches = 0
+        self.publishes = []
+        self.queue_depth = []
+        self.cpu = {'fetch': 0.0, 'refresh': 0.0, 'dedupe+rank': 0.0, 'publish': 0.0}
+        self.wall_seconds = 0.0
+        self.simulated_seconds = 0.0
+
+    def report(self):
+        print("Replay report")
+        print("=" * 50)
+        print(f"Simulated time: {timedelta(seconds=self.simulated_seconds)}")
+        print(f"Wall time: {self.wall_seconds:.3f}s", end='')
+        if self.wall_seconds > 0:
+            print(f" ({self.simulated_seconds / self.wall_seconds:,.0f}x real time)")
+        else:
+            print()
+        print(f"Cycles: {self.cycles} | Fetches: {self.fetches} | Published: {len(self.publishes)}")
+        print("\nCPU time per stage:")
+        for stage, seconds in self.cpu.items():
+            per_cycle = seconds / self.cycles * 1000 if self.cycles else 0.0
+            print(f"   {stage:<12} {seconds * 1000:9.2f} ms total | {per_cycle:7.3f} ms/cycle")
+        print("\nQueue depth over time:")
+        for when, depth in self.queue_depth:
+            print(f"   {when.strftime('%Y-%m-%d %H:%M')}  {depth}")
+
+
+def _queue_depth(clock):
+    """Count fresh stored posts that have not been published yet"""
+    posts = open_store(POSTS_FILE, missing_ok=True).fresh(freshness_cutoff(clock))
+    history = reddit_fetcher.load_posted_history()
+    return len([p for p in posts if not reddit_fetcher.is_post_already_posted(p.id, history)])
+
+
+def run_replay(snapshot_dir, interval_hours=1, hours=None, verbose=False):
+    """Replay captured snapshots through the posting loop on a simulated clock"""
+    feed = SnapshotFeed(snapshot_dir)
+    clock = SimulatedClock(feed.start)
+    until = feed.start + timedelta(hours=hours) if hours else feed.end + timedelta(hours=interval_hours)
+    stats = ReplayStats()
+    # Compile the rules before switching to the scratch directory
+    content_filter = load_content_filter(os.path.abspath(rules_file_path()))
+
+    def fetch():
+        started = time.process_time()
+        stats.fetches += 1
+        reddit_fetcher.fetch_reddit_posts(listing=feed.listing_at(clock.now()), clock=clock,
+                                          content_filter=content_filter)
+        stats.cpu['fetch'] += time.process_time() - started
+
+    def refresh():
+        # Live scores come from the snapshot in effect at the current time
+        started = time.process_time()
+        current = {post.id: post for post in feed.listing_at(clock.now())}
+        info = lambda fullnames: [current[name[3:]] for name in fullnames if name[3:] in current]
+        refreshed = reddit_fetcher.refresh_candidate_scores(info=info, clock=clock)
+        stats.cpu['refresh'] += time.process_time() - started
+        return refreshed
+
+    def publish(title, url):
+        started = time.process_time()
+        stats.publishes.append((clock.now(), title, url))
+        stats.cpu['publish'] += time.process_time() - started
+        return True
+
+    def cycle():
+        other_stages = ('fetch', 'refresh', 'publish')
+        before = sum(stats.cpu[stage] for stage in other_stages)
+        started = time.process_time()
+        reddit_fetcher.scheduled_post(clock=clock, fetch=fetch, publish=publish, refresh=refresh)
+        elapsed = time.process_time() - started
+        stats.cpu['dedupe+rank'] += elapsed - (sum(stats.cpu[stage] for stage in other_stages) - before)
+        stats.cycles += 1
+        stats.queue_depth.append((clock.now(), _queue_depth(clock)))
+
+    # Run in a scratch directory so the real post store and history are untouched
+    original_dir = os.getcwd()
+    # Only warnings unless verbose; logging would otherwise start on the first event at LOG_LEVEL
+    setup_logging(level=None if verbose else logging.WARNING)
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        wall_started = time.perf_counter()
+        try:
+            with output:
+                reddit_fetcher.manual_posting_loop(clock=clock, interval_hours=interval_hours,
+                                                   until=until, cycle=cycle)
+        finally:
+            stats.wall_seconds = time.perf_counter() - wall_started
+            os.chdir(original_dir)
+
+    stats.simulated_seconds = (clock.now() - feed.start).total_seconds()
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capture and replay Reddit listing snapshots")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    capture_parser = subparsers.add_parser('capture', help="Save the current listing to a snapshot")
+    capture_parser.add_argument('directory')
+
+    run_parser = subparsers.add_parser('run', help="Replay snapshots on a simulated clock")
+    run_parser.add_argument('directory')
+    run_parser.add_argument('--interval-hours', type=float, default=1,
+                            help="Posting interval in hours (default 1)")
+    run_parser.add_argument('--hours', type=float, default=None,
+                            help="Simulated duration (default: until the last snapshot)")
+    run_parser.add_argument('--verbose', action='store_true',
+                            help="Show the bot's own output while replaying")
+
+    args = parser.parse_args()
+    if args.command == 'capture':
+        capture_snapshot(args.directory)
+    else:
+        run_replay(args.directory, args.interval_hours, args.hours, args.verbose).report()
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import pytest
+
+from content_filter import ContentFilter, InvalidRuleError
+
+
+def make_post(**fields):
+    post = dict(title="New chip from Intel", url="https://news.example.org/a", score=5,
+                num_comments=1, over_18=False, link_flair_text=None)
+    post.update(fields)
+    return SimpleNamespace(**post)
+
+
+def test_no_rules_only_drops_nsfw():
+    content_filter = ContentFilter({})
+    assert content_filter.allows(make_post())
+    assert content_filter.check(make_post(over_18=True)) == "nsfw"
+    assert ContentFilter({'allow_nsfw': True}).allows(make_post(over_18=True))
+
+
+def test_keyword_deny_matches_whole_words_and_phrases():
+    content_filter = ContentFilter({'keywords': {'deny': ["giveaway", "crypto scam"]}})
+    assert content_filter.check(make_post(title="Huge GIVEAWAY today")) == "keyword"
+    assert content_filter.check(make_post(title="Another crypto  scam, again")) == "keyword"
+    assert content_filter.allows(make_post(title="Giveaways are back"))
+    assert content_filter.allows(make_post(title="Crypto prices and a scam"))
+
+
+def test_keyword_allow_requires_a_match():
+    content_filter = ContentFilter({'keywords': {'allow': ["chip"]}})
+    assert content_filter.allows(make_post(title="New chip from Intel"))
+    assert content_filter.check(make_post(title="New phone from Apple")) == "keyword"
+
+
+def test_deny_wins_over_allow():
+    content_filter = ContentFilter({'keywords': {'allow': ["chip"], 'deny': ["intel"]}})
+    assert content_filter.check(make_post(title="New chip from Intel")) == "keyword"
+
+
+def test_domains_match_subdomains():
+    content_filter = ContentFilter({'domains': {'deny': ["www.example.com"]}})
+    assert content_filter.check(make_post(url="https://news.example.com/x")) == "domain"
+    assert content_filter.allows(make_post(url="https://notexample.com/x"))
+
+    content_filter = ContentFilter({'domains': {'allow': ["example.org"]}})
+    assert content_filter.allows(make_post(url="https://news.example.org/a"))
+    assert content_filter.check(make_post(url="https://example.net/a")) == "domain"
+
+
+def test_thresholds_and_flairs():
+    content_filter = ContentFilter({'min_score': 10, 'min_comments': 2, 'flairs': {'deny': ["Meme"]}})
+    assert content_filter.check(make_post(score=9, num_comments=5)) == "score"
+    assert content_filter.check(make_post(score=10, num_comments=1)) == "comments"
+    assert content_filter.check(make_post(score=10, num_comments=2, link_flair_text="meme")) == "flair"
+    assert content_filter.allows(make_post(score=10, num_comments=2))
+
+
+def test_regex_lists_are_merged():
+    content_filter = ContentFilter({'regex': {'deny': [r"\bsponsored\b", r"^\[ad\]"]}})
+    assert content_filter.check(make_post(title="Sponsored: new laptop")) == "regex"
+    assert content_filter.check(make_post(title="[AD] new laptop")) == "regex"
+    assert content_filter.allows(make_post(title="Unsponsored review"))
+
+
+def test_regex_scoped_flags_and_unnamed_groups_are_accepted():
+    content_filter = ContentFilter({'regex': {'deny': [r"(?-i:ABC)", r"(x|y)+z"]}})
+    assert content_filter.check(make_post(title="ABC news")) == "regex"
+    assert content_filter.allows(make_post(title="abc news"))
+    assert content_filter.check(make_post(title="xyxz")) == "regex"
+
+
+@pytest.mark.parametrize("pattern, message", [
+    (r"(?i)foo", "inline global flags"),
+    (r"(?P<word>\w+)", "named groups"),
+    (r"(a)\1", "backreferences"),
+    (r"(a)?(?(1)b|c)", "conditional group references"),
+    (r"(unclosed", "invalid regex"),
+])
+def test_unmergeable_regex_is_reported_by_rule(pattern, message):
+    with pytest.raises(InvalidRuleError, match=message) as excinfo:
+        ContentFilter({'regex': {'deny': [r"fine", pattern]}})
+    assert "regex.deny[1]" in str(excinfo.value)
+
+
+def test_keywords_with_punctuation_are_matched_literally():
+    content_filter = ContentFilter({'keywords': {'deny': [".NET", "C++"]}})
+    assert content_filter.check(make_post(title="What's new in .NET 9")) == "keyword"
+    assert content_filter.check(make_post(title="C++ 26 is feature complete")) == "keyword"
+    assert content_filter.allows(make_post(title="Net neutrality vote today"))
+    assert content_filter.allows(make_post(title="Rust vs C: a benchmark"))
+
+
+def test_allow_keyword_with_punctuation_requires_a_literal_match():
+    content_filter = ContentFilter({'keywords': {'allow': ["C++", "chip"]}})
+    assert content_filter.allows(make_post(title="Faster builds for C++ projects"))
+    assert content_filter.allows(make_post(title="New chip from Intel"))
+    assert content_filter.check(make_post(title="Rust vs C: a benchmark")) == "keyword"
+
+
+def test_escaped_backslash_is_not_a_backreference():
+    content_filter = ContentFilter({'regex': {'deny': [r"C:\\1"]}})
+    assert content_filter.check(make_post(title="path C:\\1 here")) == "regex"
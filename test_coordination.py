@@ -0,0 +1,87 @@
+from coordination import Coordinator
+
+
+def make_workers(tmp_path):
+    db_path = str(tmp_path / 'coordination.db')
+    first = Coordinator('worker-a', db_path=db_path)
+    second = Coordinator('worker-b', db_path=db_path)
+    first.heartbeat()
+    second.heartbeat()
+    return first, second
+
+
+def expire_lease(coordinator):
+    with coordinator._connect() as conn:
+        conn.execute("UPDATE leases SET heartbeat = 0 WHERE worker_id = ?", (coordinator.worker_id,))
+
+
+def test_claim_is_exclusive_while_claimant_lease_is_live(tmp_path):
+    first, second = make_workers(tmp_path)
+    assert first.claim('abc')
+    assert second.is_claimed('abc')
+    assert not second.claim('abc')
+
+
+def test_claim_taken_over_only_after_claimant_lease_expires(tmp_path):
+    first, second = make_workers(tmp_path)
+    assert first.claim('abc')
+    expire_lease(first)
+    assert not second.is_claimed('abc')
+    assert second.claim('abc')
+    assert not first.confirm('abc')
+    assert second.confirm('abc')
+
+
+def test_published_post_is_never_taken_over(tmp_path):
+    first, second = make_workers(tmp_path)
+    assert first.claim('abc')
+    assert first.confirm('abc')
+    expire_lease(first)
+    assert second.is_claimed('abc')
+    assert not second.claim('abc')
+
+
+def test_own_claim_can_be_renewed_and_released(tmp_path):
+    first, second = make_workers(tmp_path)
+    assert first.claim('abc')
+    assert first.claim('abc')
+    first.release('abc')
+    assert not second.is_claimed('abc')
+    assert second.claim('abc')
+
+
+def test_restarted_worker_releases_its_unpublished_claims(tmp_path):
+    first, second = make_workers(tmp_path)
+    assert first.claim('abc')
+    expire_lease(first)
+    # The worker crashed mid-publish and comes back with the same ID
+    restarted = Coordinator('worker-a', db_path=first.db_path)
+    restarted.start_heartbeat()
+    try:
+        assert not restarted.is_claimed('abc')
+        assert not second.is_claimed('abc')
+        assert restarted.claim('abc')
+    finally:
+        restarted.stop()
+
+
+def test_items_of_an_expired_worker_move_and_the_rest_stay(tmp_path):
+    first, second = make_workers(tmp_path)
+    third = Coordinator('worker-c', db_path=first.db_path)
+    third.heartbeat()
+    workers = (first, second, third)
+    items = [f"subreddit{i}" for i in range(30)]
+    before = {worker.worker_id: worker.assigned(items) for worker in workers}
+    assert all(before.values())
+    assert sorted(sum(before.values(), [])) == sorted(items)
+
+    expire_lease(third)
+    after = {worker.worker_id: worker.assigned(items) for worker in (first, second)}
+    assert sorted(sum(after.values(), [])) == sorted(items)
+    # Survivors keep what they owned and pick up the expired worker's items
+    for worker_id, owned in after.items():
+        assert set(before[worker_id]) <= set(owned)
+    assert set(before['worker-c']) <= set(after['worker-a']) | set(after['worker-b'])
+
+    expire_lease(second)
+    assert first.assigned(items) == items
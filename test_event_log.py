@@ -0,0 +1,72 @@
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+import event_log
+from event_log import cycle_trace, log_event, post_trace, setup_logging, shutdown_logging, stage
+
+
+@pytest.fixture
+def events():
+    """Route events into a buffer; the fixture returns a function that reads them back"""
+    shutdown_logging()
+    stream = io.StringIO()
+    setup_logging(level=logging.INFO, stream=stream)
+
+    def read():
+        shutdown_logging()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield read
+    shutdown_logging()
+
+
+def make_record(event):
+    return event_log.logger.makeRecord(event_log.logger.name, logging.INFO, __file__, 0, event,
+                                       None, None, extra={'fields': {}})
+
+
+def test_events_are_json_lines_with_trace_ids(events):
+    with cycle_trace() as cycle_id:
+        with post_trace('abc') as post_trace_id:
+            with stage('publish', attempt=1):
+                pass
+    log_event('outside', count=2)
+    lines = events()
+    assert [line['event'] for line in lines] == ['post_trace', 'stage', 'outside']
+    stage_event = lines[1]
+    assert stage_event['cycle_id'] == cycle_id
+    assert stage_event['post_trace_id'] == post_trace_id
+    assert stage_event['stage'] == 'publish'
+    assert stage_event['attempt'] == 1
+    assert 'duration_ms' in stage_event
+    assert lines[2] == {'ts': lines[2]['ts'], 'level': 'INFO', 'event': 'outside', 'count': 2}
+
+
+def test_traceback_is_kept_in_exc(events):
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        log_event('boom', logging.ERROR, exc_info=True, post_id='abc')
+    [line] = events()
+    assert line['event'] == 'boom'
+    assert line['post_id'] == 'abc'
+    assert 'ZeroDivisionError' in line['exc']
+
+
+def test_full_queue_drops_without_blocking_and_reports_the_count():
+    handler = event_log._DroppingQueueHandler(queue.Queue(maxsize=2))
+    for i in range(5):
+        handler.handle(make_record(f"event{i}"))
+    assert handler.dropped == 3
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == ['event0', 'event1']
+
+    handler.handle(make_record('after'))
+    report = handler.queue.get_nowait()
+    assert report.msg == 'log_events_dropped'
+    assert report.fields == {'dropped': 3}
+    assert handler.queue.get_nowait().msg == 'after'
+    assert handler.dropped == 0
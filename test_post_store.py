@@ -0,0 +1,48 @@
+from post_store import CandidateStore, load_posts, open_store
+
+
+def make_record(post_id, created_utc):
+    return dict(id=post_id, title=f"Post {post_id}", url=f"https://example.org/{post_id}", score=1,
+                num_comments=0, created_utc=created_utc, author="someone", content="")
+
+
+def make_store(tmp_path):
+    store = CandidateStore(str(tmp_path / 'posts.db'), bucket_seconds=100)
+    store.merge([
+        make_record('a', 0), make_record('b', 99),
+        make_record('c', 100), make_record('d', 150),
+        make_record('e', 250),
+    ])
+    return store
+
+
+def test_evict_drops_exactly_the_expired_buckets(tmp_path):
+    store = make_store(tmp_path)
+    # Bucket [0, 100) has ended, bucket [100, 200) straddles the cutoff
+    assert sorted(store.evict_expired(160)) == ['a', 'b']
+    assert sorted(store.posts) == ['c', 'd', 'e']
+    assert sorted(post.id for post in load_posts(store.store_path)) == ['c', 'd', 'e']
+    assert [post.id for post in store.fresh(160)] == ['e']
+
+
+def test_evict_on_a_bucket_boundary(tmp_path):
+    store = make_store(tmp_path)
+    assert store.evict_expired(99) == []
+    assert sorted(store.evict_expired(200)) == ['a', 'b', 'c', 'd']
+    assert sorted(post.id for post in load_posts(store.store_path)) == ['e']
+
+
+def test_cold_fields_are_read_by_id(tmp_path):
+    store = make_store(tmp_path)
+    assert store.posts['c'].author == "someone"
+    assert open_store(store.store_path).posts['c'].content == ""
+
+
+def test_update_counts_writes_only_changed_rows(tmp_path):
+    store = make_store(tmp_path)
+    store.update_counts({'a': (1, 0), 'c': (42, 7), 'missing': (5, 5)})
+    assert (store.posts['c'].score, store.posts['c'].num_comments) == (42, 7)
+    reloaded = {post.id: post for post in load_posts(store.store_path)}
+    assert (reloaded['c'].score, reloaded['c'].num_comments) == (42, 7)
+    assert (reloaded['a'].score, reloaded['a'].num_comments) == (1, 0)
+    assert 'missing' not in reloaded
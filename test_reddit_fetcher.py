@@ -0,0 +1,66 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from clock import SimulatedClock
+from post_store import load_posts, save_records
+from reddit_fetcher import refresh_candidate_scores
+
+NOW = 1_700_000_000
+CLOCK = SimulatedClock(datetime.utcfromtimestamp(NOW))
+
+
+def make_record(post_id, score, created_utc=NOW - 60):
+    return dict(id=post_id, title=f"Post {post_id}", url=f"https://example.org/{post_id}", score=score,
+                num_comments=0, created_utc=created_utc, author="someone", content="")
+
+
+def make_queue(tmp_path, records, posted_ids=()):
+    store_path = str(tmp_path / 'posts.db')
+    history_path = str(tmp_path / 'history.json')
+    save_records(records, store_path)
+    with open(history_path, 'w') as f:
+        json.dump({'posted_ids': list(posted_ids), 'last_posted': None}, f)
+    return store_path, history_path
+
+
+class FakeInfo:
+    """Stands in for reddit.info(); records each batch and doubles the scores"""
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.batches = []
+
+    def __call__(self, fullnames):
+        self.batches.append(fullnames)
+        return [SimpleNamespace(id=name[3:], score=self.scores[name[3:]] * 2, num_comments=7)
+                for name in fullnames]
+
+
+def test_candidates_are_looked_up_in_batches_of_100(tmp_path):
+    records = [make_record(f"p{i}", i) for i in range(250)]
+    store_path, history_path = make_queue(tmp_path, records)
+    info = FakeInfo({record['id']: record['score'] for record in records})
+
+    refreshed = refresh_candidate_scores(info=info, store_path=store_path, history_path=history_path,
+                                         clock=CLOCK, limit=250)
+
+    assert refreshed == 250
+    assert [len(batch) for batch in info.batches] == [100, 100, 50]
+    assert all(name.startswith('t3_') for batch in info.batches for name in batch)
+    stored = {post.id: post for post in load_posts(store_path)}
+    assert (stored['p10'].score, stored['p10'].num_comments) == (20, 7)
+
+
+def test_limit_picks_the_top_unposted_fresh_candidates(tmp_path, monkeypatch):
+    monkeypatch.setenv('FRESHNESS_HOURS', '24')
+    records = [make_record(f"p{i}", i) for i in range(10)]
+    records.append(make_record('stale', 100, created_utc=NOW - 48 * 60 * 60))
+    store_path, history_path = make_queue(tmp_path, records, posted_ids=['p9'])
+    info = FakeInfo({record['id']: record['score'] for record in records})
+
+    refreshed = refresh_candidate_scores(info=info, store_path=store_path, history_path=history_path,
+                                         clock=CLOCK, limit=3)
+
+    assert refreshed == 3
+    assert info.batches == [['t3_p8', 't3_p7', 't3_p6']]
@@ -0,0 +1,44 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from replay import run_replay
+
+CAPTURED_UTC = 1_700_000_000
+
+
+def make_record(post_id, created_utc, score):
+    return dict(id=post_id, title=f"Post {post_id}", author="someone", score=score,
+                url=f"https://example.org/{post_id}", created_utc=created_utc, num_comments=0, content="")
+
+
+def write_snapshots(directory):
+    directory.mkdir()
+    first = [make_record('a', CAPTURED_UTC - 600, 10), make_record('b', CAPTURED_UTC - 300, 5)]
+    second = first + [make_record('c', CAPTURED_UTC + 3000, 50)]
+    for name, captured_utc, posts in (('first', CAPTURED_UTC, first), ('second', CAPTURED_UTC + 3600, second)):
+        with open(directory / f"{name}.json", 'w') as f:
+            json.dump({'captured_utc': captured_utc, 'posts': posts}, f)
+
+
+def test_replay_publishes_every_post_in_a_scratch_directory(tmp_path, monkeypatch):
+    write_snapshots(tmp_path / 'snapshots')
+    workdir = tmp_path / 'work'
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+
+    stats = run_replay(str(tmp_path / 'snapshots'), interval_hours=1)
+
+    assert os.getcwd() == str(workdir)
+    assert list(workdir.iterdir()) == []
+    assert not list(tmp_path.rglob('technews_posts.db'))
+
+    assert stats.cycles == 3
+    assert [title for _, title, _ in stats.publishes] == ['Post a', 'Post b', 'Post c']
+    start = datetime.utcfromtimestamp(CAPTURED_UTC)
+    # The third post only shows up once the second snapshot is fetched
+    assert stats.queue_depth == [
+        (start, 1),
+        (start + timedelta(hours=1), 0),
+        (start + timedelta(hours=2), 0),
+    ]